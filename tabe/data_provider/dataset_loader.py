@@ -1,6 +1,7 @@
 import os
 import numpy as np
 import pandas as pd
+import torch
 from utils.timefeatures import time_features
 from torch.utils.data import Dataset, DataLoader
 from tabe.utils.misc_util import logger
@@ -29,6 +30,21 @@ data_dict = {
 }
 
 
+# Iterates the dataset sample by sample in order, adding the batch dimension (of size 1). 
+# Used instead of DataLoader for step-by-step loading, 
+# since its sampler, fetcher and collation are not needed for one-sample batches.
+class _SingleSampleIterable(object):
+    def __init__(self, data_set):
+        self.data_set = data_set
+
+    def __len__(self):
+        return len(self.data_set)
+
+    def __iter__(self):
+        for i in range(len(self.data_set)):
+            yield tuple(torch.tensor(d[None]) for d in self.data_set[i])
+
+
 def _data_provider(configs, flag, step_by_step=False):
     Data = data_dict[configs.data]
     timeenc = 0 if configs.embed != 'timeF' else 1
@@ -37,7 +53,13 @@ def _data_provider(configs, flag, step_by_step=False):
     shuffle_flag = False if (flag == 'test' or flag == 'TEST' or step_by_step) else True
     drop_last = False
     batch_size = configs.batch_size if not step_by_step else 1
+    # For step-by-step (batch_size=1) loading, worker processes only add IPC overhead for each tiny sample.
+    num_workers = configs.num_workers if not step_by_step else 0
     freq = configs.freq
+    # Keep the worker processes alive across epochs, e.g., for 'val' loader re-iterated at every training step.
+    # NOTE: pin_memory is not used. The datasets produce float64, and the models convert batches 
+    # with .float() on host before copying to device, so pinned batches would never be the copy source.
+    persistent_workers = num_workers > 0
 
     if configs.task_name == 'anomaly_detection':
         drop_last = False
@@ -51,8 +73,9 @@ def _data_provider(configs, flag, step_by_step=False):
             data_set,
             batch_size=batch_size,
             shuffle=shuffle_flag,
-            num_workers=configs.num_workers,
-            drop_last=drop_last)    
+            num_workers=num_workers,
+            drop_last=drop_last,
+            persistent_workers=persistent_workers)    
     elif configs.task_name == 'classification':
         drop_last = False
         data_set = Data(
@@ -64,8 +87,9 @@ def _data_provider(configs, flag, step_by_step=False):
             data_set,
             batch_size=batch_size,
             shuffle=shuffle_flag,
-            num_workers=configs.num_workers,
+            num_workers=num_workers,
             drop_last=drop_last,
+            persistent_workers=persistent_workers,
             collate_fn=lambda x: collate_fn(x, max_len=configs.seq_len)
         )
     else:
@@ -83,12 +107,16 @@ def _data_provider(configs, flag, step_by_step=False):
             freq=freq,
             seasonal_patterns=configs.seasonal_patterns
         )
-        data_loader = DataLoader(
-            data_set,
-            batch_size=batch_size,
-            shuffle=shuffle_flag,
-            num_workers=configs.num_workers,
-            drop_last=drop_last)
+        if step_by_step:
+            data_loader = _SingleSampleIterable(data_set)
+        else:
+            data_loader = DataLoader(
+                data_set,
+                batch_size=batch_size,
+                shuffle=shuffle_flag,
+                num_workers=num_workers,
+                drop_last=drop_last,
+                    persistent_workers=persistent_workers)
         
     return data_set, data_loader
 
@@ -97,12 +125,11 @@ def _data_provider(configs, flag, step_by_step=False):
 # We assume that the values of 'args' are always the same. 
 # If a (Dataset, DataLoader) correspoinding to the 'flag' and 'step_by_step' parameters
 # has been created before, then the cached objects are retunred. 
+# The cache is keyed by the (flag, step_by_step) tuple.
 _cache_dataset = {}
 _cache_dataloader = {}
 def get_data_provider(configs, flag, step_by_step=False):
-    key = flag
-    if step_by_step:
-        key += '_stb'
+    key = (flag, step_by_step)
     if key not in _cache_dataset:
         _cache_dataset[key], _cache_dataloader[key] = _data_provider(configs, flag, step_by_step)
     return _cache_dataset[key], _cache_dataloader[key]
@@ -1,6 +1,7 @@
 
 
 import os 
+import functools
 import yfinance as yf
 import numpy as np
 import pandas as pd
@@ -118,6 +119,15 @@ def _stock_data_gen(
 
 
 
+# The same data file is read for every period (flag) of the dataset. 
+# So, the parsed DataFrame is cached to read the file only once.
+# NOTE: The returned DataFrame is shared, so it must not be modified in-place.
+@functools.lru_cache(maxsize=8)
+def _load_raw(filepath):
+    return pd.read_csv(filepath)
+
+
+
 # To be able to keep the temporal sequence of the 'continous onestep test/train' for the test_peroid, 
 # validation_set should not be located in the middle of train_set and test_set. 
 # In that case, lookup_window (length of seq_len) of the first datapoint of test_set 
@@ -190,8 +200,7 @@ class Dataset_TABE_File(Dataset):
         return 'unknown', None
 
     def __read_data__(self):
-        df_raw = pd.read_csv(os.path.join(self.root_path,
-                                          self.data_path))
+        df_raw = _load_raw(os.path.join(self.root_path, self.data_path))
         '''
         df_raw.columns: ['date', ...(other features), target feature]
         '''
@@ -249,6 +258,8 @@ class Dataset_TABE_File(Dataset):
 
         self.data_x = data[border1:border2]
         self.data_y = data[border1:border2]
+        # the next timestep truths of all the samples, as a contiguous 1D array
+        self.truth_targets = np.ascontiguousarray(self.data_y[self.seq_len:, -1])
 
         # if self.set_type == 0 and self.args.augmentation_ratio > 0:
         #     self.data_x, self.data_y, augmentation_tags = run_augmentation_single(self.data_x, self.data_y, self.args)
@@ -277,6 +288,14 @@ class Dataset_TABE_File(Dataset):
         else :
             return data
 
+    # Inverse-transform the values of the target feature (the last column) only. 
+    # StandardScaler works column-wise, so the values need not be padded to all the features.
+    def inverse_transform_target(self, data):
+        if self.scale:
+            return data * self.scaler.scale_[-1] + self.scaler.mean_[-1]
+        else :
+            return data
+
 
 class Dataset_TABE_Online(Dataset_TABE_File):
     def __init__(self, args, root_path=None, flag='base_train', size=None,
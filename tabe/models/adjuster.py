@@ -24,7 +24,11 @@ import tabe.utils.report as report
 smoke_test = "CI" in os.environ  # ignore; used to check code integrity in the Pyro repo
 assert pyro.__version__.startswith('1.9.1')
 pyro.set_rng_seed(0)
-torch.set_default_tensor_type(torch.DoubleTensor)
+
+# NOTE
+# Gaussian Process Model is fitted in double precision. 
+# Instead of changing the global default dtype, the tensors for GP are created with this dtype explicitly.
+_GPM_DTYPE = torch.float64
 
 
 _mem_util = MemUtil(rss_mem=False, python_mem=False)
@@ -176,8 +180,8 @@ class GpmAdjuster(AdjusterModel):
         }
         input_dim = 1
         # TODO ; optimize the HPs of GP
-        variance = torch.tensor(1) 
-        lengthscale = torch.tensor(1.5)
+        variance = torch.tensor(1.0, dtype=_GPM_DTYPE) 
+        lengthscale = torch.tensor(1.5, dtype=_GPM_DTYPE)
         kernel_name = self.configs.gpm_kernel
         kernel_class = kernels[kernel_name][0]
         need_lengthscale = kernels[kernel_name][1]
@@ -196,7 +200,7 @@ class GpmAdjuster(AdjusterModel):
         X = y[:-1]
         y = y[1:]
         gpm = gp.models.GPRegression(X, y, self.gpm_kernel, 
-                                            noise=torch.tensor(self.gpm_noise), mean_function=None, jitter=1e-6)
+                                            noise=torch.tensor(self.gpm_noise, dtype=_GPM_DTYPE), mean_function=None, jitter=1e-6)
         gpm.set_data(X, y)
         self.optimizer = torch.optim.Adam(gpm.parameters(), lr=0.005)
         self.loss_fn = pyro.infer.Trace_ELBO().differentiable_loss
@@ -253,9 +257,9 @@ class GpmAdjuster(AdjusterModel):
             losses = []
             for t in range(len(deviations) - self.HPO_EVAL_PEROID, len(deviations)):
                 if gpm is None:
-                    gpm = self._train_new_gpmodel(hp_dict, torch.Tensor(deviations[:t]))
+                    gpm = self._train_new_gpmodel(hp_dict, torch.tensor(deviations[:t], dtype=_GPM_DTYPE))
                 else:
-                    gpm = self._forward_onestep(hp_dict, gpm, torch.tensor([deviations[t]]))
+                    gpm = self._forward_onestep(hp_dict, gpm, torch.tensor([deviations[t]], dtype=_GPM_DTYPE))
                 exp_deviation, _ = self._predict_next(self.truths, self.y_hat, self.y_hat_cbm, user_param=gpm)
                 next_y_hat = self.y_hat_cbm[t] + exp_deviation
                 next_y = self.truths[t]
@@ -297,7 +301,7 @@ class GpmAdjuster(AdjusterModel):
                                 self._get_result_path()+"/hpo_result.pdf")
 
         deviations = y - y_hat_cbm
-        self.gpm = self._train_new_gpmodel(self.hp_dict, torch.Tensor(deviations))
+        self.gpm = self._train_new_gpmodel(self.hp_dict, torch.tensor(deviations, dtype=_GPM_DTYPE))
         y_hat = np.copy(y_hat_cbm)
         return y_hat
 
@@ -320,7 +324,7 @@ class GpmAdjuster(AdjusterModel):
         y_hat = super().proceed_onestep(y, y_hat_cbm, training)
 
         if training:
-            true_deviation = torch.tensor([y.item() - y_hat_cbm])
+            true_deviation = torch.tensor([float(y) - y_hat_cbm], dtype=_GPM_DTYPE)
             self.gpm = self._forward_onestep(self.hp_dict, self.gpm, true_deviation)
 
         # Adaptive HPO 
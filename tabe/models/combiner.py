@@ -171,15 +171,16 @@ class CombinerModel(AbstractModel):
 
         train_dataset, train_loader = get_data_provider(self.configs, flag='ensemble_train', step_by_step=True)
 
-        basemodel_preds = np.empty((len(self.basemodels), len(train_loader)))
-        basemodel_losses = np.empty((len(self.basemodels), len(train_loader)))
+        # Fortran order, since the predictions of all base models are written for one timestep (column) at a time
+        basemodel_preds = np.empty((len(self.basemodels), len(train_loader)), order='F')
+        basemodel_losses = np.empty((len(self.basemodels), len(train_loader)), order='F')
 
         for t, (batch_x, batch_y, batch_x_mark, batch_y_mark) in enumerate(train_loader):
             for m, basemodel in enumerate(self.basemodels):
                 basemodel_losses[m, t], basemodel_preds[m, t] = basemodel.proceed_onestep(
                     batch_x, batch_y, batch_x_mark, batch_y_mark, 
                     training=True) # NOTE : Base models ARE trained in ensemble_training period.
-            _mem_util.print_memory_usage()
+            _mem_util.print_memory_usage(t=t)
 
         spent_time = (time.time() - time_now) 
         logger.info(f"CombinerModel.train() : {spent_time:.4f} sec elapsed for getting base models' predictions")
@@ -236,12 +237,12 @@ class CombinerModel(AbstractModel):
         time_now = time.time()
 
         test_data, test_loader = get_data_provider(self.configs, flag='test', step_by_step=True)
-        y = test_data.data_y[self.configs.seq_len:, -1]
+        y = test_data.truth_targets
         need_to_invert_data = True if (test_data.scale and self.configs.inverse) else False
 
         # prepare the forecasted values of base models in test period
-        basemodel_preds = np.empty((len(self.basemodels), len(test_loader)))
-        basemodel_losses = np.empty((len(self.basemodels), len(test_loader)))
+        basemodel_preds = np.empty((len(self.basemodels), len(test_loader)), order='F')
+        basemodel_losses = np.empty((len(self.basemodels), len(test_loader)), order='F')
         for t, (batch_x, batch_y, batch_x_mark, batch_y_mark) in enumerate(test_loader):
             for m, basemodel in enumerate(self.basemodels):
                 basemodel_preds[m, t] = basemodel.proceed_onestep(
@@ -269,13 +270,8 @@ class CombinerModel(AbstractModel):
                            self._get_result_path() + "/basemodel_weights.pdf")
 
         if need_to_invert_data:
-            n_features = test_data.data_y.shape[1]
-            data_y = np.zeros((len(y), n_features))
-            data_y_hat = np.zeros((len(y), n_features))
-            data_y[:, -1] = y
-            data_y_hat[:, -1] = y_hat
-            y = test_data.inverse_transform(data_y)[:, -1]
-            y_hat = test_data.inverse_transform(data_y_hat)[:, -1]
+            y = test_data.inverse_transform_target(y)
+            y_hat = test_data.inverse_transform_target(y_hat)
 
         losses = self.criterion(torch.tensor(y_hat), y)
 
@@ -28,7 +28,6 @@ import tabe.utils.report as report
 smoke_test = "CI" in os.environ  # ignore; used to check code integrity in the Pyro repo
 assert pyro.__version__.startswith('1.9.1')
 pyro.set_rng_seed(0)
-torch.set_default_tensor_type(torch.DoubleTensor)
 
 
 _mem_util = MemUtil(rss_mem=False, python_mem=False)
@@ -40,18 +39,37 @@ class TabeModel(AbstractModel):
         super().__init__(configs, "Tabe")
         self.combiner_model = combiner_model # must've been trained already
         self.adjuster_model = adjuster_model # Model used to adjust. TimeMoE
+        # History buffers of truths and predictions, preallocated in train() 
+        # with length len(ensemble_train) + len(test). Only the first '_cursor' entries are valid.
         self.y_hat = None
-        self.truths = None # the last 'y' values. shape = (HPO_EVALUATION_PEROID)
+        self.y_hat_cbm = None
+        self.truths = None
+        self._cursor = 0 # number of valid entries in truths, y_hat, y_hat_cbm
+
+        # Warm up the datasets (and loaders) used in train() and test(), 
+        # so that reading and scaling the data is not done at the first timestep of them.
+        get_data_provider(configs, flag='ensemble_train', step_by_step=True)
+        get_data_provider(configs, flag='test', step_by_step=True)
  
 
     def train(self):
         self.combiner_model.train()
 
         train_dataset, train_loader = get_data_provider(self.configs, flag='ensemble_train', step_by_step=True)
-        y = train_dataset.data_y[self.configs.seq_len:, -1] # the next timestep truth [-1] is excluded
+        y = train_dataset.truth_targets # the next timestep truths
         assert len(y) == len(train_loader)
 
-        y_hat_cbm = np.empty_like(y)
+        # Preallocate the history buffers for both ensemble_train and test periods, 
+        # so that proceed_onestep() can write each new value in-place. 
+        # Only the first '_cursor' entries are valid.
+        _, test_loader = get_data_provider(self.configs, flag='test', step_by_step=True)
+        total_len = len(train_loader) + len(test_loader)
+        self.truths = np.empty(total_len)
+        self.y_hat = np.empty(total_len)
+        self.y_hat_cbm = np.empty(total_len)
+
+        # Combiner's predictions are host scalars. So, they are written directly into the history buffer.
+        y_hat_cbm = self.y_hat_cbm[:len(y)]
         for t, (batch_x, batch_y, batch_x_mark, batch_y_mark) in enumerate(train_loader):
             y_hat_t, _ = self.combiner_model.proceed_onestep(
                 batch_x, batch_y, batch_x_mark, batch_y_mark)
@@ -63,20 +81,36 @@ class TabeModel(AbstractModel):
         else:
             y_hat = self.adjuster_model.train(y, y_hat_cbm)
 
-        self.truths = y
-        self.y_hat = y_hat
-        self.y_hat_cbm = y_hat_cbm
+        self.truths[:len(y)] = y
+        self.y_hat[:len(y)] = y_hat
+        self._cursor = len(y)
+
+
+    # Write the values of the current timestep at '_cursor' of the history buffers. 
+    # The buffers are grown (doubled) only if they are full, e.g., when test() is run more than once.
+    def _append_history(self, y_hat_cbm, y_hat_tabe, y):
+        if self._cursor == len(self.truths):
+            self.truths = np.resize(self.truths, 2 * len(self.truths))
+            self.y_hat = np.resize(self.y_hat, 2 * len(self.y_hat))
+            self.y_hat_cbm = np.resize(self.y_hat_cbm, 2 * len(self.y_hat_cbm))
+        self.y_hat_cbm[self._cursor] = y_hat_cbm
+        self.y_hat[self._cursor] = y_hat_tabe
+        self.truths[self._cursor] = y
+        self._cursor += 1
 
 
-    def proceed_onestep(self, batch_x, batch_y, batch_x_mark, batch_y_mark, training: bool = False):
+    def proceed_onestep(self, batch_x, batch_y, batch_x_mark, batch_y_mark, training: bool = False, truth=None):
         assert batch_x.shape[0]==1 and batch_y.shape[0]==1
 
-        # truth at the next timestep
-        y = batch_y[0, -1, -1] 
+        # truth at the next timestep. 
+        # Callers iterating over a dataset can pass it from the precomputed truth column.
+        # Scalars are unboxed to python floats once, to be stored directly in the history buffers.
+        y = batch_y[0, -1, -1].item() if truth is None else float(truth)
 
         # get combiner model's predition
         y_hat_cbm, y_hat_bsm = self.combiner_model.proceed_onestep(
             batch_x, batch_y, batch_x_mark, batch_y_mark, training)                
+        y_hat_cbm = float(y_hat_cbm)
 
         if self.adjuster_model is None:
             y_hat_adj = y_hat_cbm
@@ -84,11 +118,9 @@ class TabeModel(AbstractModel):
             # get next prediction of Adjuster 
             y_hat_adj = self.adjuster_model.proceed_onestep(y, y_hat_cbm, training)
 
-        y_hat_tabe = y_hat_adj  
+        y_hat_tabe = y_hat_adj.item() if torch.is_tensor(y_hat_adj) else float(y_hat_adj)
 
-        self.y_hat_cbm = np.concatenate((self.y_hat_cbm, np.array([y_hat_cbm])))
-        self.y_hat = np.concatenate((self.y_hat, np.array([y_hat_tabe])))
-        self.truths = np.concatenate((self.truths, np.array([y])))
+        self._append_history(y_hat_cbm, y_hat_tabe, y)
 
         # logger.info(f'Adj.predict : final_pred={final_pred:.5f}, y_hat={y_hat:.5f}, y_hat_cbm={y_hat_cbm:.5f}')
         return y_hat_tabe, y_hat_adj, y_hat_cbm, y_hat_bsm
@@ -96,23 +128,20 @@ class TabeModel(AbstractModel):
 
     def test(self):
         test_set, test_loader = get_data_provider(self.configs, flag='test', step_by_step=True)
-        y = test_set.data_y[self.configs.seq_len:, -1]
+        y = test_set.truth_targets
         need_to_invert_data = True if (test_set.scale and self.configs.inverse) else False
 
         tabe_pred = np.empty_like(y)
         y_hat_adj = np.empty_like(y)
         y_hat_cbm = np.empty_like(y)
-        y_hat_bsm = np.empty((len(self.combiner_model.basemodels), len(y)))
-        y_hat_q_low = np.empty_like(y)
-        y_hat_q_high = np.empty_like(y)
-        devi_stddev = np.empty_like(y)
+        y_hat_bsm = np.empty((len(self.combiner_model.basemodels), len(y)), order='F') # written column by column
 
         for t, (batch_x, batch_y, batch_x_mark, batch_y_mark) in enumerate(test_loader):
             # final_pred[t], y_hat[t], y_hat_cbm[t], y_hat_bsm[:,t], devi_stddev[t] = \
             #     self.proceed_onestep(batch_x, batch_y, batch_x_mark, batch_y_mark, training=True)            
             tabe_pred[t], y_hat_adj[t], y_hat_cbm[t], y_hat_bsm[:,t] = \
-                self.proceed_onestep(batch_x, batch_y, batch_x_mark, batch_y_mark, training=True)            
-            _mem_util.print_memory_usage()
+                self.proceed_onestep(batch_x, batch_y, batch_x_mark, batch_y_mark, training=True, truth=y[t])
+            _mem_util.print_memory_usage(t=t)
 
         # if self.use_gpm:
         #     report.plot_gpmodel(self.gpm, filepath=self._get_result_path()+"/gpmodel_analysis.pdf")
@@ -127,29 +156,12 @@ class TabeModel(AbstractModel):
         # buy_threshold_q = y_hat - devi_stddev * z_val
 
         if need_to_invert_data:
-            n_features = test_set.data_y.shape[1]
-            data_y = np.zeros((len(y), n_features))
-            data_final_pred = np.zeros((len(y), n_features))
-            # data_y_hat_q_low = np.zeros((len(y), n_features))
-            # data_y_hat_q_high = np.zeros((len(y), n_features))
-            data_buy_threshold_q = np.zeros((len(y), n_features))
-            data_y_hat_cbm = np.zeros((len(y), n_features))
-            data_y[:, -1] = y
-            data_final_pred[:, -1] = tabe_pred
-            # data_y_hat_q_low[:, -1] = y_hat_q_low
-            # data_y_hat_q_high[:, -1] = y_hat_q_high
-            # data_buy_threshold_q[:, -1] = buy_threshold_q
-            data_y_hat_cbm[:, -1] = y_hat_cbm
-            y = test_set.inverse_transform(data_y)[:, -1]
-            tabe_pred = test_set.inverse_transform(data_final_pred)[:, -1]
-            # y_hat_q_low = test_set.inverse_transform(data_y_hat_q_low)[:, -1]
-            # y_hat_q_high = test_set.inverse_transform(data_y_hat_q_high)[:, -1]
-            # buy_threshold_q = test_set.inverse_transform(data_buy_threshold_q)[:, -1]
-            y_hat_cbm = test_set.inverse_transform(data_y_hat_cbm)[:, -1]
-            for i in range(len(y_hat_bsm)):
-                data_y_hat_bsm = np.zeros((len(y), n_features))
-                data_y_hat_bsm[:, -1] = y_hat_bsm[i]
-                y_hat_bsm[i] = test_set.inverse_transform(data_y_hat_bsm)[:, -1]
+            # (y_hat_q_low, y_hat_q_high, buy_threshold_q can be inverted here when they are used)
+            y = test_set.inverse_transform_target(y)
+            tabe_pred = test_set.inverse_transform_target(tabe_pred)
+            y_hat_cbm = test_set.inverse_transform_target(y_hat_cbm)
+            y_hat_bsm = test_set.inverse_transform_target(y_hat_bsm)
 
         # return y, tabe_pred, y_hat_cbm, y_hat_bsm, y_hat_q_low, y_hat_q_high, buy_threshold_q, devi_stddev
-        return y, tabe_pred, y_hat_cbm, y_hat_bsm, y_hat_q_low, y_hat_q_high, None, devi_stddev
+        # NOTE: quantiles and devi_stddev are not computed yet (See TODOs above). 
+        return y, tabe_pred, y_hat_cbm, y_hat_bsm, None, None, None, None
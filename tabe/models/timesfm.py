@@ -100,7 +100,7 @@ class TimesFM(AbstractModel):
 
         # calculate the actuall loss of next timestep
         y = batch_y[0, -1:, -1] 
-        loss = self.criterion(torch.tensor(y_hat), y).item()
+        loss = self.criterion(torch.tensor(y_hat, dtype=y.dtype), y).item()
 
         if training: # TODO 
             pass
@@ -4,6 +4,8 @@ import tracemalloc
 from tabe.utils.logger import logger
 
 
+MEM_LOG_INTERVAL = 256 # timesteps between memory usage logs in the step-by-step loops
+
 class MemUtil(object):
     _tracemalloc_started = False 
 
@@ -51,7 +53,10 @@ class MemUtil(object):
                 f"acc_incr={current - self.python_mem_init:.2f} peak={peak:.2f} MB")
         self.python_mem_prev = current
 
-    def print_memory_usage(self, rss=None, python=None):
+    # If 't' (timestep) is given, the usage is printed only at every MEM_LOG_INTERVAL timesteps.
+    def print_memory_usage(self, rss=None, python=None, t=None):
+        if t is not None and t % MEM_LOG_INTERVAL != 0:
+            return
         rss = self.rss_mem if rss is None else rss
         python = self.python_mem if python is None else python
         if rss:
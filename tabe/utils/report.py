@@ -123,7 +123,7 @@ def plot_gpmodel(gpm, plot_observed_data=True, plot_predictions=True, n_test=500
         ax.plot(gpm.X.numpy(), gpm.y.numpy(), "kx", label="observations")
 
     if plot_predictions:
-        Xtest = torch.linspace(x_range[0], x_range[1], n_test) 
+        Xtest = torch.linspace(x_range[0], x_range[1], n_test, dtype=gpm.X.dtype) 
         # compute predictive mean and variance
         with torch.no_grad():
             if type(gpm) == gp.models.VariationalSparseGP: